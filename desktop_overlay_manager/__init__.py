@@ -3,15 +3,22 @@
 from __future__ import annotations
 
 import json
+import logging
+import os
 import threading
-import time
-from concurrent.futures import Future
+from collections import deque
+from functools import cached_property, partial
+from itertools import chain
 from pathlib import Path
-from queue import Empty, Queue
-from typing import Any, Dict, Optional
+from typing import Any, Deque, Dict, Optional, Set, Tuple
 
 import tkinter as tk
 
+try:  # Optional C-accelerated JSON; stdlib json is used when unavailable.
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None  # type: ignore[assignment]
+
 from .overlay import (
     DraggableOverlay,
     DraggablePoint,
@@ -24,25 +31,72 @@ from .overlay import (
 DEFAULT_RECT = {"x": 120, "y": 120, "width": 240, "height": 160}
 DEFAULT_POINT = {"x": 160, "y": 160}
 CONFIG_FILENAME = "overlays.json"
+MIGRATED_SENTINEL = ".migrated"
+LEGACY_FILENAMES = ("rects.json", "points.json")
+CONFIG_FLUSH_DELAY_MS = 250
+
+_log = logging.getLogger(__name__)
+
+
+def _dumps(data: Dict[str, Any]) -> bytes:
+    # The config file is machine-managed, so it is written compactly.
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _loads(raw: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
 
 
 class Desktop_overlay_manager:
     """High level manager for draggable rectangles and points."""
 
-    def __init__(self, config_dir: Optional[str] = None, loop_interval: float = 0.01) -> None:
+    def __init__(
+        self,
+        config_dir: Optional[str] = None,
+        loop_interval: float = 0.1,
+        fsync: bool = False,
+    ) -> None:
         self.config_dir = Path(config_dir or Path.home() / ".desktop_overlay_manager")
         self.config_dir.mkdir(parents=True, exist_ok=True)
         self.loop_interval = loop_interval
+        # Opt-in durability: flush the temp file to disk before the rename.
+        self.fsync = fsync
         self._config_path = self.config_dir / CONFIG_FILENAME
+        # Plain strings for the write path, computed once instead of per save.
+        self._config_path_str = str(self._config_path)
+        self._tmp_path_str = self._config_path_str + ".tmp"
+        self._last_payload: Optional[bytes] = None
 
         self._rects: Dict[str, DraggableOverlay] = {}
         self._points: Dict[str, DraggablePoint] = {}
-        self._config = self._load_all_configs()
-        self._rect_configs = self._config.setdefault("rects", {})
-        self._point_configs = self._config.setdefault("points", {})
+        # Last geometry reported by each widget (refreshed on every drag redraw),
+        # readable from any thread without a hop into Tk (plain dict
+        # reads/writes are GIL-atomic).
+        self._rect_snapshot: Dict[str, Tuple[int, int, int, int]] = {}
+        self._point_snapshot: Dict[str, Tuple[int, int]] = {}
+        # Geometry last written to the config per id, to drop reports that
+        # would not change it (set by _apply_dirty_entries, not the callbacks).
+        self._last_rect_geom: Dict[str, Tuple[int, int, int, int]] = {}
+        self._last_point_geom: Dict[str, Tuple[int, int]] = {}
+        self._dirty_rects: Set[str] = set()
+        self._dirty_points: Set[str] = set()
+        self._write_timer: Optional[str] = None
+        # Serialisation and disk I/O run on a writer thread so the Tk thread
+        # only copies widget geometry into the config; the lock guards the
+        # config dict between the two.
+        self._config_lock = threading.Lock()
+        self._write_pending = False
+        self._write_requested = threading.Event()
+        self._writer_thread: Optional[threading.Thread] = None
 
         self._tk_thread: Optional[threading.Thread] = None
-        self._tk_queue: Queue[tuple[Future, Any, tuple, dict]] = Queue()
+        self._tk_thread_started = False
+        self._tk_tasks: Deque[tuple[Any, tuple, dict]] = deque()
+        self._drain_scheduled = threading.Event()
         self._root_ready = threading.Event()
         self._stop_event = threading.Event()
         self._root: Optional[tk.Tk] = None
@@ -64,47 +118,10 @@ class Desktop_overlay_manager:
         **style: Any,
     ) -> None:
         """Create or show a draggable rectangle."""
-
-        def _create() -> None:
-            config = self._rect_configs.get(rect_id, {})
-            rect_data = {
-                "x": x if x is not None else config.get("x", DEFAULT_RECT["x"]),
-                "y": y if y is not None else config.get("y", DEFAULT_RECT["y"]),
-                "width": width if width is not None else config.get("width", DEFAULT_RECT["width"]),
-                "height": height if height is not None else config.get("height", DEFAULT_RECT["height"]),
-            }
-            rect_label = label or config.get("label", rect_id)
-
-            def _callback(nx: int, ny: int, w: int, h: int) -> None:
-                self._rect_configs[rect_id] = {
-                    "x": nx,
-                    "y": ny,
-                    "width": w,
-                    "height": h,
-                    "label": rect_label,
-                }
-                self._save_all_configs()
-
-            overlay = self._rects.get(rect_id)
-            if overlay is None:
-                overlay = create_overlay(
-                    root=self._root,  # type: ignore[arg-type]
-                    x=rect_data["x"],
-                    y=rect_data["y"],
-                    width=rect_data["width"],
-                    height=rect_data["height"],
-                    label=rect_label,
-                    on_rect_update=_callback,
-                    **style,
-                )
-                self._rects[rect_id] = overlay
-            else:
-                overlay.update_position(rect_data["x"], rect_data["y"], notify=False)
-                overlay.update_size(rect_data["width"], rect_data["height"], notify=False)
-                overlay.update_label(rect_label)
-                overlay.show()
-
-        self._call_in_tk_thread(_create)
+        # Drop the stale snapshot now so a getRect() issued before the
+        # registration runs falls through to the (ordered) Tk-thread read.
+        self._rect_snapshot.pop(rect_id, None)
+        self._post_to_tk_thread(self._do_register_rect, rect_id, label, x, y, width, height, style)
 
     def registerPosition(
         self,
@@ -116,40 +133,8 @@ class Desktop_overlay_manager:
         **style: Any,
     ) -> None:
         """Create or show a draggable point marker."""
-
-        def _create() -> None:
-            config = self._point_configs.get(point_id, {})
-            point_data = {
-                "x": x if x is not None else config.get("x", DEFAULT_POINT["x"]),
-                "y": y if y is not None else config.get("y", DEFAULT_POINT["y"]),
-            }
-            point_label = label or config.get("label", point_id)
-
-            def _callback(nx: int, ny: int) -> None:
-                self._point_configs[point_id] = {
-                    "x": nx,
-                    "y": ny,
-                    "label": point_label,
-                }
-                self._save_all_configs()
-
-            point = self._points.get(point_id)
-            if point is None:
-                point = create_point(
-                    root=self._root,  # type: ignore[arg-type]
-                    x=point_data["x"],
-                    y=point_data["y"],
-                    label=point_label,
-                    callback=_callback,
-                    **style,
-                )
-                self._points[point_id] = point
-            else:
-                point.update_position(point_data["x"], point_data["y"], notify=False)
-                point.update_label(point_label)
-                point.show()
-
-        self._call_in_tk_thread(_create)
+        self._point_snapshot.pop(point_id, None)
+        self._post_to_tk_thread(self._do_register_position, point_id, label, x, y, style)
 
     # Typo-friendly alias
     def regsterPositon(self, *args: Any, **kwargs: Any) -> None:  # pragma: no cover
@@ -157,34 +142,69 @@ class Desktop_overlay_manager:
 
     def getRect(self, rect_id: str) -> Optional[Dict[str, int]]:
         """Return last known rectangle geometry."""
+        snapshot = self._rect_snapshot.get(rect_id)
+        if snapshot is not None:
+            x, y, width, height = snapshot
+            return {"x": x, "y": y, "width": width, "height": height}
 
-        def _read() -> Optional[Dict[str, int]]:
-            overlay = self._rects.get(rect_id)
-            if overlay is not None:
-                x, y, width, height = overlay.get_position()
-                return {"x": x, "y": y, "width": width, "height": height}
-            if rect_id in self._rect_configs:
-                saved = self._rect_configs[rect_id].copy()
-                return {k: int(v) for k, v in saved.items() if k in {"x", "y", "width", "height"}}
-            return None
-
-        return self._call_in_tk_thread(_read)
+        return self._call_in_tk_thread(self._read_rect, rect_id)
 
     def getPosition(self, point_id: str) -> Optional[Dict[str, int]]:
         """Return last known point coordinates."""
+        snapshot = self._point_snapshot.get(point_id)
+        if snapshot is not None:
+            x, y = snapshot
+            return {"x": x, "y": y}
 
-        def _read() -> Optional[Dict[str, int]]:
-            point = self._points.get(point_id)
-            if point is not None:
-                x, y = point.get_position()
-                return {"x": x, "y": y}
-            if point_id in self._point_configs:
-                saved = self._point_configs[point_id].copy()
-                return {k: int(v) for k, v in saved.items() if k in {"x", "y"}}
-            return None
+        return self._call_in_tk_thread(self._read_point, point_id)
+
+    def getAllRects(self) -> Dict[str, Dict[str, int]]:
+        """Return getRect() for every registered or persisted rectangle in one Tk hop."""
+
+        def _read() -> Dict[str, Dict[str, int]]:
+            rects = {}
+            for rect_id in chain(self._rects, self._rect_configs):
+                if rect_id not in rects:
+                    rect = self._read_rect(rect_id)
+                    if rect is not None:
+                        rects[rect_id] = rect
+            return rects
 
         return self._call_in_tk_thread(_read)
 
+    def getAllPositions(self) -> Dict[str, Dict[str, int]]:
+        """Return getPosition() for every registered or persisted point in one Tk hop."""
+
+        def _read() -> Dict[str, Dict[str, int]]:
+            points = {}
+            for point_id in chain(self._points, self._point_configs):
+                if point_id not in points:
+                    pos = self._read_point(point_id)
+                    if pos is not None:
+                        points[point_id] = pos
+            return points
+
+        return self._call_in_tk_thread(_read)
+
+    def clampAllToScreen(self) -> None:
+        """Move every visible overlay and point back inside the screen."""
+
+        def _clamp() -> None:
+            for rect_id, overlay in self._rects.items():
+                overlay.clamp_to_screen()
+                self._rect_snapshot[rect_id] = overlay.get_position()
+            for point_id, point in self._points.items():
+                point.clamp_to_screen()
+                self._point_snapshot[point_id] = point.get_position()
+
+        # As in registerRect: drop the snapshots now so getters issued before
+        # the clamp runs wait for it in the Tk thread instead of reading them.
+        for rect_id in list(self._rects):
+            self._rect_snapshot.pop(rect_id, None)
+        for point_id in list(self._points):
+            self._point_snapshot.pop(point_id, None)
+        self._post_to_tk_thread(_clamp)
+
     def hideAll(self) -> None:
         """Hide all overlays and points."""
 
@@ -194,7 +214,7 @@ class Desktop_overlay_manager:
             for point in self._points.values():
                 point.hide()
 
-        self._call_in_tk_thread(_hide)
+        self._post_to_tk_thread(_hide)
 
     def showAll(self) -> None:
         """Show all overlays and points."""
@@ -205,81 +225,279 @@ class Desktop_overlay_manager:
             for point in self._points.values():
                 point.show()
 
-        self._call_in_tk_thread(_show)
+        self._post_to_tk_thread(_show)
 
     def destroy(self) -> None:
         """Destroy all widgets and stop Tk loop."""
+        if self._stop_event.is_set():
+            return
 
         def _destroy() -> None:
-            clear_all_overlays()
-            clear_all_points()
-            self._rects.clear()
-            self._points.clear()
-
-        self._call_in_tk_thread(_destroy)
-        self._stop_event.set()
-        if self._tk_thread and self._tk_thread.is_alive():
-            self._tk_thread.join(timeout=1)
+            try:
+                if self._write_timer is not None:
+                    self._root.after_cancel(self._write_timer)  # type: ignore[union-attr]
+                    self._write_timer = None
+                self._flush_config()
+                # Write synchronously so the file is complete when destroy() returns.
+                self._write_pending_config()
+            finally:
+                # A failed save (read-only dir, full disk) must not leave the
+                # windows and the Tk thread running; the error still propagates.
+                clear_all_overlays()
+                clear_all_points()
+                self._rects.clear()
+                self._points.clear()
+                self._rect_snapshot.clear()
+                self._point_snapshot.clear()
+                self._last_rect_geom.clear()
+                self._last_point_geom.clear()
+                self._root.quit()  # type: ignore[union-attr]
+
+        # Wait only for the flush and widget teardown; the mainloop exits on
+        # its own after quit(), and the thread is a daemon, so no join.
+        try:
+            self._call_in_tk_thread(_destroy)
+        finally:
+            self._stop_event.set()
+            self._tk_thread_started = False
+            if self._writer_thread is not None:
+                self._write_requested.set()
+                self._writer_thread.join()
 
     # ------------------------------------------------------------------ #
     # Internal helpers
     # ------------------------------------------------------------------ #
+    @cached_property
+    def _config(self) -> Dict[str, Dict[str, Any]]:
+        # Parsed on first use rather than in __init__, so constructing a
+        # manager never waits on reading or migrating the config file.
+        return self._load_all_configs()
+
+    @property
+    def _rect_configs(self) -> Dict[str, Any]:
+        return self._config["rects"]
+
+    @property
+    def _point_configs(self) -> Dict[str, Any]:
+        return self._config["points"]
+
+    def _read_rect(self, rect_id: str) -> Optional[Dict[str, int]]:
+        # Tk thread only. Same order as getRect(): snapshot, live widget, config.
+        snapshot = self._rect_snapshot.get(rect_id)
+        if snapshot is not None:
+            x, y, width, height = snapshot
+            return {"x": x, "y": y, "width": width, "height": height}
+        overlay = self._rects.get(rect_id)
+        if overlay is not None:
+            x, y, width, height = overlay.get_position()
+            return {"x": x, "y": y, "width": width, "height": height}
+        if rect_id in self._rect_configs:
+            saved = self._rect_configs[rect_id].copy()
+            rect = {k: int(v) for k, v in saved.items() if k in {"x", "y", "width", "height"}}
+            if len(rect) == 4:
+                # Unloaded entries only change on re-register, which drops the snapshot.
+                self._rect_snapshot[rect_id] = (rect["x"], rect["y"], rect["width"], rect["height"])
+            return rect
+        return None
+
+    def _read_point(self, point_id: str) -> Optional[Dict[str, int]]:
+        snapshot = self._point_snapshot.get(point_id)
+        if snapshot is not None:
+            x, y = snapshot
+            return {"x": x, "y": y}
+        point = self._points.get(point_id)
+        if point is not None:
+            x, y = point.get_position()
+            return {"x": x, "y": y}
+        if point_id in self._point_configs:
+            saved = self._point_configs[point_id].copy()
+            pos = {k: int(v) for k, v in saved.items() if k in {"x", "y"}}
+            if len(pos) == 2:
+                self._point_snapshot[point_id] = (pos["x"], pos["y"])
+            return pos
+        return None
+
+    def _do_register_rect(
+        self,
+        rect_id: str,
+        label: str,
+        x: Optional[int],
+        y: Optional[int],
+        width: Optional[int],
+        height: Optional[int],
+        style: Dict[str, Any],
+    ) -> None:
+        config = self._rect_configs.get(rect_id, {})
+        rect_data = {
+            "x": x if x is not None else config.get("x", DEFAULT_RECT["x"]),
+            "y": y if y is not None else config.get("y", DEFAULT_RECT["y"]),
+            "width": width if width is not None else config.get("width", DEFAULT_RECT["width"]),
+            "height": height if height is not None else config.get("height", DEFAULT_RECT["height"]),
+        }
+        rect_label = label or config.get("label", rect_id)
+
+        overlay = self._rects.get(rect_id)
+        if overlay is None:
+            overlay = create_overlay(
+                root=self._root,  # type: ignore[arg-type]
+                x=rect_data["x"],
+                y=rect_data["y"],
+                width=rect_data["width"],
+                height=rect_data["height"],
+                label=rect_label,
+                on_rect_update=partial(self._on_rect_update, rect_id),
+                on_move=partial(self._on_rect_move, rect_id),
+                **style,
+            )
+            self._rects[rect_id] = overlay
+        else:
+            overlay.update_position(rect_data["x"], rect_data["y"], notify=False)
+            overlay.update_size(rect_data["width"], rect_data["height"], notify=False)
+            overlay.update_label(rect_label)
+            overlay.show()
+        self._rect_snapshot[rect_id] = overlay.get_position()
+
+    def _do_register_position(
+        self,
+        point_id: str,
+        label: str,
+        x: Optional[int],
+        y: Optional[int],
+        style: Dict[str, Any],
+    ) -> None:
+        config = self._point_configs.get(point_id, {})
+        point_data = {
+            "x": x if x is not None else config.get("x", DEFAULT_POINT["x"]),
+            "y": y if y is not None else config.get("y", DEFAULT_POINT["y"]),
+        }
+        point_label = label or config.get("label", point_id)
+
+        point = self._points.get(point_id)
+        if point is None:
+            point = create_point(
+                root=self._root,  # type: ignore[arg-type]
+                x=point_data["x"],
+                y=point_data["y"],
+                label=point_label,
+                callback=partial(self._on_point_update, point_id),
+                on_move=partial(self._on_point_move, point_id),
+                **style,
+            )
+            self._points[point_id] = point
+        else:
+            point.update_position(point_data["x"], point_data["y"], notify=False)
+            point.update_label(point_label)
+            point.show()
+        self._point_snapshot[point_id] = point.get_position()
+
+    def _on_rect_update(self, rect_id: str, x: int, y: int, width: int, height: int) -> None:
+        geom = (x, y, width, height)
+        self._rect_snapshot[rect_id] = geom
+        if self._last_rect_geom.get(rect_id) == geom:
+            return
+        self._dirty_rects.add(rect_id)
+        self._schedule_flush()
+
+    def _on_rect_move(self, rect_id: str, x: int, y: int, width: int, height: int) -> None:
+        # Mid-drag: keep getters current; persistence waits for the release.
+        self._rect_snapshot[rect_id] = (x, y, width, height)
+
+    def _on_point_update(self, point_id: str, x: int, y: int) -> None:
+        geom = (x, y)
+        self._point_snapshot[point_id] = geom
+        if self._last_point_geom.get(point_id) == geom:
+            return
+        self._dirty_points.add(point_id)
+        self._schedule_flush()
+
+    def _on_point_move(self, point_id: str, x: int, y: int) -> None:
+        self._point_snapshot[point_id] = (x, y)
+
     def _ensure_tk_thread(self) -> None:
+        if self._stop_event.is_set():
+            return
         if self._tk_thread and self._tk_thread.is_alive():
             return
 
         self._tk_thread = threading.Thread(target=self._run_tk_loop, daemon=True)
         self._tk_thread.start()
         self._root_ready.wait()
+        self._tk_thread_started = True
 
     def _run_tk_loop(self) -> None:
         self._root = tk.Tk()
         self._root.withdraw()
-        self._root_ready.set()
-
-        while not self._stop_event.is_set():
-            self._drain_queue()
-            try:
-                self._root.update_idletasks()
-                self._root.update()
-            except tk.TclError:
-                break
-            time.sleep(self.loop_interval)
-
-        self._drain_queue(set_exception=True)
+        # Release callers only once mainloop is dispatching, so their
+        # cross-thread after_idle() calls never race the interpreter start-up.
+        self._root.after_idle(self._root_ready.set)
         try:
-            self._root.destroy()
-        except tk.TclError:
-            pass
-
-    def _drain_queue(self, set_exception: bool = False) -> None:
-        while True:
+            self._root.mainloop()
+        finally:
+            self._tk_thread_started = False
+            self._stop_event.set()
             try:
-                future, func, args, kwargs = self._tk_queue.get_nowait()
-            except Empty:
-                break
-            if set_exception:
-                future.set_exception(RuntimeError("Tk loop already stopped"))
-                continue
+                self._root.destroy()
+            except tk.TclError:
+                pass
+
+    def _post_to_tk_thread(self, func: Any, *args: Any, **kwargs: Any) -> None:
+        """Schedule ``func`` on the Tk thread without waiting for it."""
+        # Steady-state fast path: skip the is_alive() probe once started.
+        if not self._tk_thread_started:
+            self._ensure_tk_thread()
+        if self._stop_event.is_set():
+            raise RuntimeError("Tk loop already stopped")
+        # deque.append is atomic under the GIL; only the first task of a burst
+        # pays for a cross-thread after_idle, the rest ride the same drain.
+        self._tk_tasks.append((func, args, kwargs))
+        if not self._drain_scheduled.is_set():
+            self._drain_scheduled.set()
+            self._root.after_idle(self._drain_queue)  # type: ignore[union-attr]
+
+    def _drain_queue(self) -> None:
+        # Clear before draining so a task appended mid-drain either gets
+        # popped below or schedules a fresh drain.
+        self._drain_scheduled.clear()
+        tasks = self._tk_tasks
+        while tasks:
+            func, args, kwargs = tasks.popleft()
             try:
-                result = func(*args, **kwargs)
-            except Exception as exc:  # pragma: no cover - best-effort guard
-                future.set_exception(exc)
-            else:
-                future.set_result(result)
+                func(*args, **kwargs)
+            except Exception:  # keep draining after a bad task
+                # Posted calls are fire-and-forget, so this is the only place
+                # their errors surface.
+                _log.exception("Error in call posted to the Tk thread")
 
     def _call_in_tk_thread(self, func: Any, *args: Any, **kwargs: Any) -> Any:
-        self._ensure_tk_thread()
-        future: Future = Future()
-        self._tk_queue.put((future, func, args, kwargs))
-        return future.result()
+        """Run ``func`` on the Tk thread and return its result."""
+        done = threading.Event()
+        outcome: list = [None, None]
+
+        def _run_and_signal() -> None:
+            try:
+                outcome[0] = func(*args, **kwargs)
+            except Exception as exc:  # re-raised in the calling thread below
+                outcome[1] = exc
+            finally:
+                done.set()
+
+        self._post_to_tk_thread(_run_and_signal)
+        # Block on the event itself so we wake the moment the call finishes;
+        # loop_interval only bounds how often we check the Tk thread is alive.
+        while not done.wait(self.loop_interval):
+            # Re-check done: a call that quits the loop (destroy) may finish
+            # and let the thread exit between the timeout and this probe.
+            if not (self._tk_thread and self._tk_thread.is_alive()) and not done.is_set():
+                raise RuntimeError("Tk loop already stopped")
+        if outcome[1] is not None:
+            raise outcome[1]
+        return outcome[0]
 
     def _load_all_configs(self) -> Dict[str, Dict[str, Any]]:
         if self._config_path.exists():
             try:
-                with self._config_path.open("r", encoding="utf-8") as fh:
-                    data = json.load(fh)
-            except (json.JSONDecodeError, OSError):
+                data = _loads(self._config_path.read_bytes())
+            except (ValueError, OSError):
                 data = {}
             if not isinstance(data, dict):
                 data = {}
@@ -288,18 +506,25 @@ class Desktop_overlay_manager:
                 "points": data.get("points", {}) if isinstance(data.get("points"), dict) else {},
             }
 
-        legacy = self._migrate_legacy_configs()
-        if legacy is not None:
-            return legacy
+        sentinel = self.config_dir / MIGRATED_SENTINEL
+        if not sentinel.exists():
+            legacy = self._migrate_legacy_configs()
+            sentinel.touch()
+            if legacy is not None:
+                return legacy
         return {"rects": {}, "points": {}}
 
     def _migrate_legacy_configs(self) -> Optional[Dict[str, Dict[str, Any]]]:
-        rects = self._load_legacy_file("rects.json")
-        points = self._load_legacy_file("points.json")
+        rects = self._load_legacy_file(LEGACY_FILENAMES[0])
+        points = self._load_legacy_file(LEGACY_FILENAMES[1])
         if not rects and not points:
             return None
         data = {"rects": rects, "points": points}
         self._write_config_file(data)
+        # Everything now lives in overlays.json; drop the sources we migrated.
+        for filename, migrated in zip(LEGACY_FILENAMES, (rects, points)):
+            if migrated:
+                (self.config_dir / filename).unlink(missing_ok=True)
         return data
 
     def _load_legacy_file(self, filename: str) -> Dict[str, Any]:
@@ -307,22 +532,89 @@ class Desktop_overlay_manager:
         if not path.exists():
             return {}
         try:
-            with path.open("r", encoding="utf-8") as fh:
-                data = json.load(fh)
-                return data if isinstance(data, dict) else {}
-        except (json.JSONDecodeError, OSError):
+            data = _loads(path.read_bytes())
+            return data if isinstance(data, dict) else {}
+        except (ValueError, OSError):
             return {}
 
-    def _save_all_configs(self) -> None:
-        self._config["rects"] = self._rect_configs
-        self._config["points"] = self._point_configs
-        self._write_config_file(self._config)
+    def _schedule_flush(self) -> None:
+        # Drags report once per gesture but can arrive in bursts; coalesce
+        # them into a single write per CONFIG_FLUSH_DELAY_MS window.
+        if self._write_timer is None:
+            self._write_timer = self._root.after(  # type: ignore[union-attr]
+                CONFIG_FLUSH_DELAY_MS, self._on_flush_timer
+            )
+
+    def _on_flush_timer(self) -> None:
+        self._write_timer = None
+        if self._flush_config():
+            if self._writer_thread is None:
+                self._writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
+                self._writer_thread.start()
+            self._write_requested.set()
+
+    def _writer_loop(self) -> None:
+        while True:
+            self._write_requested.wait()
+            self._write_requested.clear()
+            if self._stop_event.is_set():
+                return
+            try:
+                self._write_pending_config()
+            except Exception:  # keep the writer alive on I/O errors
+                _log.exception("Failed to write %s", self._config_path_str)
+
+    def _write_pending_config(self) -> None:
+        with self._config_lock:
+            if not self._write_pending:
+                return
+            self._write_pending = False
+            self._write_config_file(self._config)
+
+    def _flush_config(self) -> bool:
+        """Copy dirty widget geometry into the config; return whether anything changed."""
+        if not self._dirty_rects and not self._dirty_points:
+            return False
+        with self._config_lock:
+            self._apply_dirty_entries()
+            self._write_pending = True
+        return True
+
+    def _apply_dirty_entries(self) -> None:
+        # Only entries whose widgets reported a change are re-read.
+        for rect_id in self._dirty_rects:
+            overlay = self._rects.get(rect_id)
+            if overlay is None:
+                continue
+            # Update the existing entry in place rather than allocating a new one.
+            entry = self._rect_configs.setdefault(rect_id, {})
+            geom = overlay.get_position()
+            entry["x"], entry["y"], entry["width"], entry["height"] = geom
+            entry["label"] = overlay.label
+            self._last_rect_geom[rect_id] = geom
+        for point_id in self._dirty_points:
+            point = self._points.get(point_id)
+            if point is None:
+                continue
+            entry = self._point_configs.setdefault(point_id, {})
+            geom = point.get_position()
+            entry["x"], entry["y"] = geom
+            entry["label"] = point.label
+            self._last_point_geom[point_id] = geom
+        self._dirty_rects.clear()
+        self._dirty_points.clear()
 
     def _write_config_file(self, data: Dict[str, Any]) -> None:
-        tmp_path = self._config_path.with_suffix(".tmp")
-        with tmp_path.open("w", encoding="utf-8") as fh:
-            json.dump(data, fh, ensure_ascii=False, indent=2)
-        tmp_path.replace(self._config_path)
+        payload = _dumps(data)
+        if payload == self._last_payload:
+            return  # e.g. a drag that ended where it started
+        with open(self._tmp_path_str, "wb") as fh:
+            fh.write(payload)
+            if self.fsync:
+                fh.flush()
+                os.fsync(fh.fileno())
+        os.replace(self._tmp_path_str, self._config_path_str)
+        self._last_payload = payload
 
 
 __all__ = ["Desktop_overlay_manager"]
@@ -4,13 +4,51 @@
 支持在屏幕任意区域创建带标签的矩形框，并支持拖动
 """
 
+import logging
+import sys
+import time
 import tkinter as tk
-from typing import Callable, Optional, Tuple, List
+import tkinter.font as tkfont
+import weakref
+from typing import Callable, Dict, Optional, Tuple, List
 
-# 全局浮层管理器
-_overlay_registry: List['DraggableOverlay'] = []
+_log = logging.getLogger(__name__)
+
+
+def _intern_label(label):
+    """驻留标签字符串：大量组件共用相同标签时只保留一份，比较也更快"""
+    return sys.intern(label) if type(label) is str else label
+
+
+# 全局浮层管理器（以 id(对象) 为键，注销为 O(1)）
+_overlay_registry: Dict[int, 'DraggableOverlay'] = {}
 # 全局点标记管理器
-_point_registry: List['DraggablePoint'] = []
+_point_registry: Dict[int, 'DraggablePoint'] = {}
+# 标签字体缓存：同一 Tk 解释器中相同字体描述的点标记共用一个 Font 及其行高
+# （以 root 为弱引用键，root 被回收后缓存随之释放）
+_font_cache: 'weakref.WeakKeyDictionary[tk.Misc, dict]' = weakref.WeakKeyDictionary()
+
+
+def _get_label_font(root: tk.Misc, label_font) -> Tuple[tkfont.Font, int]:
+    """
+    获取（或创建并缓存）标签字体
+    
+    Args:
+        root: 主窗口
+        label_font: 字体描述，如 (family, size, weight)
+    
+    Returns:
+        (Font 对象, 行高) 元组
+    """
+    fonts = _font_cache.get(root)
+    if fonts is None:
+        fonts = _font_cache[root] = {}
+    key = tuple(label_font) if isinstance(label_font, list) else label_font
+    cached = fonts.get(key)
+    if cached is None:
+        font = tkfont.Font(root=root, font=label_font)
+        cached = fonts[key] = (font, font.metrics("linespace"))
+    return cached
 
 
 class DraggableOverlay:
@@ -38,6 +76,19 @@ class DraggableOverlay:
         root.mainloop()
     """
     
+    # 内部属性放在 __slots__ 中以减小实例体积；另保留 __dict__，
+    # 调用方仍可在实例上附加自定义属性
+    __slots__ = (
+        "root", "x", "y", "width", "height", "label", "callback", "border_color",
+        "border_width", "bg_color", "label_bg", "label_fg", "label_font", "alpha",
+        "draggable", "resizable", "resize_handle_size", "dragging", "resizing",
+        "start_x", "start_y", "offset_x", "offset_y", "start_width", "start_height",
+        "_flush_scheduled", "_flush_after_id", "_resize_pending",
+        "_min_redraw_interval", "_last_redraw", "_pending_commit", "overlay", "canvas",
+        "label_widget", "_label_text", "_border_id", "resize_handle", "_screen_w",
+        "_screen_h", "visible", "_handle_min_x", "_handle_min_y", "on_move", "__dict__",
+    )
+    
     def __init__(
         self,
         root: tk.Tk,
@@ -57,6 +108,8 @@ class DraggableOverlay:
         draggable: bool = True,  # 是否可拖动
         resizable: bool = True,  # 是否可调整大小
         resize_handle_size: int = 10,  # 调整大小手柄的大小
+        max_redraw_hz: float = 60.0,  # 拖动/调整大小时的最大重绘频率
+        on_move: Optional[Callable[[int, int, int, int], None]] = None,
     ):
         """
         初始化浮层组件
@@ -79,14 +132,18 @@ class DraggableOverlay:
             draggable: 是否可拖动
             resizable: 是否可调整大小
             resize_handle_size: 调整大小手柄的大小（像素）
+            max_redraw_hz: 拖动/调整大小时每秒最多重绘次数（<= 0 表示不限制），释放鼠标时总会绘制最终状态
+            on_move: 拖动/调整大小过程中每次重绘窗口后调用，参数为 (x, y, width, height)；
+                不同于 on_rect_update，它不等待释放鼠标
         """
         self.root = root
         self.x = x
         self.y = y
         self.width = width
         self.height = height
-        self.label = label
+        self.label = _intern_label(label)
         self.callback = on_rect_update  # 保持向后兼容，内部使用 callback
+        self.on_move = on_move
         
         # 样式设置
         self.border_color = border_color
@@ -101,6 +158,7 @@ class DraggableOverlay:
         self.draggable = draggable
         self.resizable = resizable
         self.resize_handle_size = resize_handle_size
+        self._update_handle_bounds()
         
         # 拖动相关变量
         self.dragging = False
@@ -112,23 +170,54 @@ class DraggableOverlay:
         self.start_width = 0
         self.start_height = 0
         
+        # 拖动/调整大小时的几何刷新合并（每个空闲周期最多刷新一次）
+        self._flush_scheduled = False
+        self._flush_after_id = None
+        self._resize_pending = False
+        self._min_redraw_interval = 1.0 / max_redraw_hz if max_redraw_hz > 0 else 0.0
+        self._last_redraw = 0.0
+        # 本次拖动/调整大小是否实际改变了几何（只有改变时释放鼠标才通知回调）
+        self._pending_commit = False
+        
         # 创建浮层窗口
         self.overlay = None
         self.canvas = None
         self.label_widget = None
+        self._label_text = None  # 标签内的 tk.Label，用于原地修改文字
+        self._border_id = None  # 边框矩形的 canvas item id
         self.resize_handle = None  # 调整大小手柄
         
+        # 屏幕尺寸（在 show() 时缓存）
+        self._screen_w = 0
+        self._screen_h = 0
+        
         # 是否可见
         self.visible = False
         
         # 注册到全局管理器
-        _overlay_registry.append(self)
+        _overlay_registry[id(self)] = self
     
     def show(self):
         """显示浮层"""
         if self.visible:
             return
         
+        # 缓存屏幕尺寸，拖动时无需每个事件都查询 Tk
+        self._screen_w = self.root.winfo_screenwidth()
+        self._screen_h = self.root.winfo_screenheight()
+        
+        # 已隐藏（withdraw）的窗口直接恢复，无需重建 Canvas 和事件绑定
+        if self.overlay is not None:
+            self._update_geometry()
+            self._draw_border()
+            self._sync_label()
+            if self.resizable:
+                self._create_resize_handle()
+            self.overlay.deiconify()
+            self.overlay.lift()
+            self.visible = True
+            return
+        
         # 创建 Toplevel 窗口
         self.overlay = tk.Toplevel(self.root)
         self.overlay.overrideredirect(True)  # 移除窗口边框和标题栏
@@ -159,7 +248,7 @@ class DraggableOverlay:
         
         # 创建标签（如果有）
         if self.label:
-            self._create_label()
+            self._build_label()
         
         # 创建调整大小手柄（如果启用）
         if self.resizable:
@@ -176,15 +265,11 @@ class DraggableOverlay:
         self.visible = True
     
     def hide(self):
-        """隐藏浮层"""
+        """隐藏浮层（仅 withdraw 窗口，再次 show 时无需重建）"""
         if not self.visible or not self.overlay:
             return
         
-        self.overlay.destroy()
-        self.overlay = None
-        self.canvas = None
-        self.label_widget = None
-        self.resize_handle = None
+        self.overlay.withdraw()
         self.visible = False
     
     def update_position(self, x: int, y: int, notify: bool = True):
@@ -220,11 +305,11 @@ class DraggableOverlay:
         
         self.width = width
         self.height = height
+        self._update_handle_bounds()
         if self.visible:
+            # 标签固定在左上角，大小变化时无需重建
             self._update_geometry()
             self._draw_border()
-            if self.label_widget:
-                self._create_label()
             if self.resizable:
                 self._create_resize_handle()
             if notify:
@@ -237,13 +322,13 @@ class DraggableOverlay:
         Args:
             label: 新的标签文本
         """
+        # 文本未变化时标签控件已与之一致，直接返回
+        label = _intern_label(label)
+        if label == self.label:
+            return
         self.label = label
         if self.visible:
-            if self.label:
-                self._create_label()
-            elif self.label_widget:
-                self.label_widget.destroy()
-                self.label_widget = None
+            self._sync_label()
     
     def _update_geometry(self):
         """更新窗口位置和大小"""
@@ -257,10 +342,13 @@ class DraggableOverlay:
         if not self.canvas:
             return
         
-        self.canvas.delete("border")
+        # 已有边框时只移动坐标，避免每次删除并重建 canvas item
+        if self._border_id is not None:
+            self.canvas.coords(self._border_id, 0, 0, self.width, self.height)
+            return
         
         # 绘制矩形边框
-        self.canvas.create_rectangle(
+        self._border_id = self.canvas.create_rectangle(
             0,
             0,
             self.width,
@@ -275,13 +363,6 @@ class DraggableOverlay:
         if not self.canvas or not self.resizable:
             return
         
-        # 删除旧的手柄
-        if self.resize_handle is not None:
-            try:
-                self.canvas.delete(self.resize_handle)
-            except:
-                pass
-        
         # 手柄位置（右下角）
         handle_size = self.resize_handle_size
         x1 = self.width - handle_size
@@ -289,6 +370,11 @@ class DraggableOverlay:
         x2 = self.width
         y2 = self.height
         
+        # 已有手柄时只移动坐标；事件通过 tag_bind 绑定在标签上，无需重新绑定
+        if self.resize_handle is not None:
+            self.canvas.coords(self.resize_handle, x1, y1, x2, y2)
+            return
+        
         # 绘制调整大小手柄（小正方形）
         self.resize_handle = self.canvas.create_rectangle(
             x1,
@@ -307,24 +393,22 @@ class DraggableOverlay:
         self.canvas.tag_bind("resize_handle", "<ButtonRelease-1>", self._on_resize_release)
         
         # 改变鼠标样式为调整大小样式
-        def set_resize_cursor(e):
-            self.canvas.config(cursor="sizing")
-        
-        def reset_cursor(e):
-            self.canvas.config(cursor="")
-        
-        self.canvas.tag_bind("resize_handle", "<Enter>", set_resize_cursor)
-        self.canvas.tag_bind("resize_handle", "<Leave>", reset_cursor)
+        self.canvas.tag_bind("resize_handle", "<Enter>", self._set_resize_cursor)
+        self.canvas.tag_bind("resize_handle", "<Leave>", self._reset_cursor)
     
-    def _create_label(self):
-        """创建标签"""
-        if not self.canvas:
+    def _set_resize_cursor(self, event):
+        """鼠标进入调整大小手柄时切换光标"""
+        self.canvas.config(cursor="sizing")
+    
+    def _reset_cursor(self, event):
+        """鼠标离开调整大小手柄时恢复光标"""
+        self.canvas.config(cursor="")
+    
+    def _build_label(self):
+        """创建标签控件（只创建一次，之后只修改文字）"""
+        if not self.canvas or self.label_widget is not None:
             return
         
-        # 删除旧标签
-        if self.label_widget:
-            self.label_widget.destroy()
-        
         # 创建标签 Frame
         label_frame = tk.Frame(
             self.overlay,
@@ -343,10 +427,31 @@ class DraggableOverlay:
         )
         label_text.pack()
         
-        # 将标签放置在窗口左上角
-        label_frame.place(x=0, y=0)
+        # 让标签也可以拖动
+        label_frame.bind("<Button-1>", self._on_mouse_press)
+        label_frame.bind("<B1-Motion>", self._on_mouse_drag_global)
+        label_frame.bind("<ButtonRelease-1>", self._on_mouse_release_global)
         
         self.label_widget = label_frame
+        self._label_text = label_text
+        self._place_label()
+    
+    def _place_label(self):
+        """将标签放置在窗口左上角"""
+        if self.label_widget:
+            self.label_widget.place_configure(x=0, y=0)
+    
+    def _sync_label(self):
+        """让标签控件与 self.label 保持一致（原地修改文字，不重建控件）"""
+        if self.label:
+            if self.label_widget:
+                self._label_text.configure(text=self.label)
+            else:
+                self._build_label()
+        elif self.label_widget:
+            self.label_widget.destroy()
+            self.label_widget = None
+            self._label_text = None
     
     def _bind_events(self):
         """绑定事件"""
@@ -360,20 +465,15 @@ class DraggableOverlay:
         self.canvas.bind("<B1-Motion>", self._on_mouse_drag_global)
         # 鼠标释放事件（全局绑定）
         self.canvas.bind("<ButtonRelease-1>", self._on_mouse_release_global)
-        
-        # 让标签也可以拖动
-        if self.label_widget:
-            self.label_widget.bind("<Button-1>", self._on_mouse_press)
-            self.label_widget.bind("<B1-Motion>", self._on_mouse_drag_global)
-            self.label_widget.bind("<ButtonRelease-1>", self._on_mouse_release_global)
+    
+    def _update_handle_bounds(self):
+        """缓存调整大小手柄的命中区域（宽高变化时调用）"""
+        self._handle_min_x = self.width - self.resize_handle_size
+        self._handle_min_y = self.height - self.resize_handle_size
     
     def _is_in_resize_handle(self, x: int, y: int) -> bool:
         """检查坐标是否在调整大小手柄区域内"""
-        if not self.resizable:
-            return False
-        handle_size = self.resize_handle_size
-        return (x >= self.width - handle_size and 
-                y >= self.height - handle_size)
+        return self.resizable and x >= self._handle_min_x and y >= self._handle_min_y
     
     def _on_mouse_press(self, event):
         """鼠标按下事件处理"""
@@ -411,38 +511,51 @@ class DraggableOverlay:
             new_y = self.offset_y + delta_y
             
             # 限制窗口不超出屏幕
-            screen_width = self.root.winfo_screenwidth()
-            screen_height = self.root.winfo_screenheight()
-            new_x = max(0, min(new_x, screen_width - self.width))
-            new_y = max(0, min(new_y, screen_height - self.height))
+            # （热路径：用条件表达式代替 max/min 内建函数调用）
+            max_x = self._screen_w - self.width
+            max_y = self._screen_h - self.height
+            new_x = max_x if new_x > max_x else new_x
+            new_x = 0 if new_x < 0 else new_x
+            new_y = max_y if new_y > max_y else new_y
+            new_y = 0 if new_y < 0 else new_y
             
             # 更新位置（拖动过程中不通知回调，只在释放时通知）
-            self.x = int(new_x)
-            self.y = int(new_y)
-            self._update_geometry()
+            # 窗口几何在空闲时统一刷新，避免每个移动事件都调用 geometry()
+            nx, ny = int(new_x), int(new_y)
+            if nx == self.x and ny == self.y:
+                # 位置没有变化（亚像素移动），无需刷新
+                return "break"
+            self.x = nx
+            self.y = ny
+            self._schedule_geometry_flush()
             
             # 阻止事件继续传播
             return "break"
     
     def _on_mouse_release_global(self, event):
         """鼠标释放事件处理（全局，处理拖动和调整大小结束）"""
+        # 立即绘制最终状态，不等待节流定时器
+        self._flush_pending_geometry()
+        
         # 处理调整大小结束
         if self.resizing:
             self.resizing = False
             self.dragging = False
-            # 调整大小结束后通知回调
-            self._notify_callback()
-            # 重新创建调整大小手柄（更新位置）
-            if self.resizable:
-                self._create_resize_handle()
+            # 调整大小结束后通知回调（单击未改变大小时不通知）
+            if self._pending_commit:
+                self._pending_commit = False
+                self._notify_callback()
+            # 手柄已在几何刷新时通过 coords 移动到位，无需重建
             return "break"
         
         # 处理拖动结束
         if self.dragging:
             self.dragging = False
             self.resizing = False
-            # 拖动结束后通知回调
-            self._notify_callback()
+            # 拖动结束后通知回调（单击未移动时不通知）
+            if self._pending_commit:
+                self._pending_commit = False
+                self._notify_callback()
             return "break"
     
     def _on_resize_press(self, event):
@@ -482,39 +595,93 @@ class DraggableOverlay:
         new_height = self.start_height + delta_y
         
         # 限制最小大小
+        # （热路径：用条件表达式代替 max/min 内建函数调用）
         min_width = 50
         min_height = 50
-        new_width = max(min_width, new_width)
-        new_height = max(min_height, new_height)
+        new_width = min_width if new_width < min_width else new_width
+        new_height = min_height if new_height < min_height else new_height
         
         # 限制不超出屏幕
-        screen_width = self.root.winfo_screenwidth()
-        screen_height = self.root.winfo_screenheight()
-        max_width = screen_width - self.offset_x
-        max_height = screen_height - self.offset_y
-        new_width = min(new_width, max_width)
-        new_height = min(new_height, max_height)
+        max_width = self._screen_w - self.offset_x
+        max_height = self._screen_h - self.offset_y
+        new_width = max_width if new_width > max_width else new_width
+        new_height = max_height if new_height > max_height else new_height
         
         # 更新大小（调整过程中不通知回调，只在释放时通知）
-        self.width = int(new_width)
-        self.height = int(new_height)
-        self._update_geometry()
-        self._draw_border()
-        # 更新调整大小手柄位置（不重新创建，避免事件丢失）
-        if self.resize_handle is not None:
-            handle_size = self.resize_handle_size
-            x1 = self.width - handle_size
-            y1 = self.height - handle_size
-            x2 = self.width
-            y2 = self.height
-            self.canvas.coords(self.resize_handle, x1, y1, x2, y2)
-        
-        if self.label_widget:
-            self._create_label()
+        nw, nh = int(new_width), int(new_height)
+        if nw == self.width and nh == self.height:
+            # 大小没有变化（亚像素移动或已到达边界），无需刷新
+            return "break"
+        self.width = nw
+        self.height = nh
+        self._update_handle_bounds()
+        self._resize_pending = True
+        self._schedule_geometry_flush()
         
         # 阻止事件继续传播
         return "break"
     
+    def _schedule_geometry_flush(self):
+        """
+        安排一次几何刷新
+        
+        同一时间最多只有一次待执行的刷新；距上次重绘不足最小间隔时延后执行，
+        从而把重绘频率限制在 max_redraw_hz 以内。
+        """
+        self._pending_commit = True
+        if self._flush_scheduled:
+            return
+        self._flush_scheduled = True
+        wait = self._min_redraw_interval - (time.monotonic() - self._last_redraw)
+        if wait > 0:
+            self._flush_after_id = self.root.after(max(1, int(wait * 1000)), self._flush_geometry)
+        else:
+            self._flush_after_id = self.root.after_idle(self._flush_geometry)
+    
+    def _flush_pending_geometry(self):
+        """如果有待执行的刷新，取消定时器并立即刷新"""
+        if not self._flush_scheduled:
+            return
+        if self._flush_after_id is not None:
+            self.root.after_cancel(self._flush_after_id)
+        self._flush_geometry()
+    
+    def _flush_geometry(self):
+        """将最新的位置和大小一次性应用到窗口"""
+        self._flush_scheduled = False
+        self._flush_after_id = None
+        resized = self._resize_pending
+        self._resize_pending = False
+        if not self.overlay:
+            return
+        
+        self._last_redraw = time.monotonic()
+        width = self.width
+        height = self.height
+        # 这是拖动的热路径：直接调用 Tcl 命令，绕过 geometry()/config()/coords()
+        # 包装层的参数处理；只移动时不需要重新配置 Canvas
+        call = self.overlay.tk.call
+        call("wm", "geometry", self.overlay._w, f"{width}x{height}+{self.x}+{self.y}")
+        if self.on_move is not None:
+            try:
+                self.on_move(self.x, self.y, width, height)
+            except Exception:
+                _log.exception("移动回调执行错误")
+        if not resized or not self.canvas:
+            return
+        
+        canvas_w = self.canvas._w
+        call(canvas_w, "configure", "-width", width, "-height", height)
+        if self._border_id is not None:
+            call(canvas_w, "coords", self._border_id, 0, 0, width, height)
+        # 更新调整大小手柄位置（不重新创建，避免事件丢失）
+        if self.resize_handle is not None:
+            handle_size = self.resize_handle_size
+            call(
+                canvas_w, "coords", self.resize_handle,
+                width - handle_size, height - handle_size, width, height,
+            )
+    
     def _on_resize_release(self, event):
         """调整大小释放事件处理（由 tag_bind 触发）"""
         # 调用全局释放处理
@@ -526,8 +693,8 @@ class DraggableOverlay:
         if self.callback:
             try:
                 self.callback(self.x, self.y, self.width, self.height)
-            except Exception as e:
-                print(f"回调函数执行错误: {e}")
+            except Exception:
+                _log.exception("回调函数执行错误")
     
     def get_position(self) -> Tuple[int, int, int, int]:
         """
@@ -538,12 +705,39 @@ class DraggableOverlay:
         """
         return (self.x, self.y, self.width, self.height)
     
+    def clamp_to_screen(self) -> bool:
+        """
+        将浮层移回屏幕范围内（使用 show() 时缓存的屏幕尺寸，移动后会通知回调）
+        
+        Returns:
+            是否发生了移动
+        """
+        if not self.visible:
+            return False
+        max_x = self._screen_w - self.width
+        max_y = self._screen_h - self.height
+        x = max_x if self.x > max_x else self.x
+        x = 0 if x < 0 else x
+        y = max_y if self.y > max_y else self.y
+        y = 0 if y < 0 else y
+        if x == self.x and y == self.y:
+            return False
+        self.update_position(x, y)
+        return True
+    
     def destroy(self):
         """销毁浮层"""
-        self.hide()
+        if self.overlay:
+            self.overlay.destroy()
+        self.overlay = None
+        self.canvas = None
+        self.label_widget = None
+        self._label_text = None
+        self._border_id = None
+        self.resize_handle = None
+        self.visible = False
         # 从全局注册表中移除
-        if self in _overlay_registry:
-            _overlay_registry.remove(self)
+        _overlay_registry.pop(id(self), None)
 
 
 class DraggablePoint:
@@ -570,6 +764,16 @@ class DraggablePoint:
         root.mainloop()
     """
     
+    # 与 DraggableOverlay 相同：固定属性用 __slots__，并保留 __dict__
+    __slots__ = (
+        "root", "x", "y", "label", "draggable", "callback", "point_color", "point_size",
+        "label_bg", "label_fg", "label_font", "alpha", "label_offset_x",
+        "label_offset_y", "dragging", "start_x", "start_y", "offset_x", "offset_y",
+        "_pending_commit", "transparent_color", "window_size", "overlay", "canvas",
+        "label_widget", "_shown_label", "_point_id", "_font", "_font_linespace",
+        "_measured_label_size", "_screen_w", "_screen_h", "visible", "on_move", "__dict__",
+    )
+    
     def __init__(
         self,
         root: tk.Tk,
@@ -586,6 +790,7 @@ class DraggablePoint:
         alpha: float = 0.9,  # 窗口透明度
         label_offset_x: int = 10,  # 标签相对于点的 x 偏移
         label_offset_y: int = -25,  # 标签相对于点的 y 偏移（负值表示在点上方）
+        on_move: Optional[Callable[[int, int], None]] = None,
     ):
         """
         初始化点标记组件
@@ -605,13 +810,15 @@ class DraggablePoint:
             alpha: 窗口透明度 (0.0-1.0)
             label_offset_x: 标签相对于点的 x 偏移
             label_offset_y: 标签相对于点的 y 偏移
+            on_move: 拖动过程中每次移动窗口后调用，参数为 (x, y)；不同于 callback，它不等待释放鼠标
         """
         self.root = root
         self.x = x
         self.y = y
-        self.label = label
+        self.label = _intern_label(label)
         self.draggable = draggable
         self.callback = callback
+        self.on_move = on_move
         
         # 样式设置
         self.point_color = point_color
@@ -629,6 +836,7 @@ class DraggablePoint:
         self.start_y = 0
         self.offset_x = 0
         self.offset_y = 0
+        self._pending_commit = False  # 本次拖动是否实际移动了点
         
         # 透明色（用于实现透明背景）
         self.transparent_color = "#000001"  # 使用一个几乎不可见的颜色作为透明色
@@ -644,18 +852,45 @@ class DraggablePoint:
         self.overlay = None
         self.canvas = None
         self.label_widget = None
+        self._shown_label = None  # 标签控件当前显示的文本
+        self._point_id = None  # 圆点的 canvas item id
+        
+        # 标签字体（需要 Tk 解释器，在 show() 时创建），用于直接测量标签大小
+        self._font = None
+        self._font_linespace = 0
+        self._measured_label_size = None  # 上次测量的标签大小 (w, h)
+        
+        # 屏幕尺寸（在 show() 时缓存）
+        self._screen_w = 0
+        self._screen_h = 0
         
         # 是否可见
         self.visible = False
         
         # 注册到全局管理器
-        _point_registry.append(self)
+        _point_registry[id(self)] = self
     
     def show(self):
         """显示点标记"""
         if self.visible:
             return
         
+        # 缓存屏幕尺寸，拖动时无需每个事件都查询 Tk
+        self._screen_w = self.root.winfo_screenwidth()
+        self._screen_h = self.root.winfo_screenheight()
+        
+        if self._font is None:
+            self._font, self._font_linespace = _get_label_font(self.root, self.label_font)
+        
+        # 已隐藏（withdraw）的窗口直接恢复，无需重建 Canvas 和事件绑定
+        if self.overlay is not None:
+            self._sync_label()
+            self._setup_geometry()
+            self.overlay.deiconify()
+            self.overlay.lift()
+            self.visible = True
+            return
+        
         # 创建 Toplevel 窗口
         self.overlay = tk.Toplevel(self.root)
         self.overlay.overrideredirect(True)  # 移除窗口边框和标题栏
@@ -668,7 +903,7 @@ class DraggablePoint:
             pass  # 如果不支持透明色属性，则忽略
         
         # 设置窗口位置和大小
-        self._update_geometry()
+        self._setup_geometry()
         
         # 创建 Canvas 用于绘制点
         # 使用透明色作为背景，配合 -transparentcolor 实现透明效果
@@ -700,14 +935,11 @@ class DraggablePoint:
         self.visible = True
     
     def hide(self):
-        """隐藏点标记"""
+        """隐藏点标记（仅 withdraw 窗口，再次 show 时无需重建）"""
         if not self.visible or not self.overlay:
             return
         
-        self.overlay.destroy()
-        self.overlay = None
-        self.canvas = None
-        self.label_widget = None
+        self.overlay.withdraw()
         self.visible = False
     
     def update_position(self, x: int, y: int, notify: bool = True):
@@ -722,7 +954,7 @@ class DraggablePoint:
         self.x = x
         self.y = y
         if self.visible:
-            self._update_geometry()
+            self._move_geometry()
             if notify:
                 self._notify_callback()
     
@@ -733,31 +965,49 @@ class DraggablePoint:
         Args:
             label: 新的标签文本
         """
+        # 文本未变化时直接返回，避免重建 Frame/Label
+        label = _intern_label(label)
+        if label == self.label:
+            return
         self.label = label
         if self.visible:
-            if self.label:
+            self._sync_label()
+    
+    def _sync_label(self):
+        """让标签控件与 self.label 保持一致（文本未变化时保留现有控件）"""
+        if self.label:
+            if self.label_widget is None or self._shown_label != self.label:
                 self._create_label()
-            elif self.label_widget:
-                self.label_widget.destroy()
-                self.label_widget = None
+        elif self.label_widget:
+            self.label_widget.destroy()
+            self.label_widget = None
+            self._shown_label = None
+    
+    def _move_geometry(self):
+        """移动窗口（拖动热路径：只调整窗口位置，Canvas 和标签相对窗口不变）"""
+        # 窗口中心点应该对应点的坐标
+        # 所以窗口左上角 = (x - window_size/2, y - window_size/2)
+        window_size = self.window_size
+        self.overlay.wm_geometry(
+            f"{window_size}x{window_size}+{self.x - window_size // 2}+{self.y - window_size // 2}"
+        )
     
-    def _update_geometry(self, update_label: bool = True):
+    def _setup_geometry(self, update_label: bool = True, size_changed: bool = False):
         """
-        更新窗口位置和大小
+        更新窗口位置和大小，并同步 Canvas、点和标签
         
         Args:
-            update_label: 是否更新标签位置（拖动过程中设为 False 以避免重复调整窗口大小）
+            update_label: 是否更新标签位置（调整窗口大小过程中设为 False 以避免递归）
+            size_changed: window_size 是否发生了变化；点始终位于窗口中心，
+                只有窗口大小变化时才需要调整 Canvas 并重绘点
         """
         if self.overlay:
-            # 窗口中心点应该对应点的坐标
-            # 所以窗口左上角 = (x - window_size/2, y - window_size/2)
-            window_x = self.x - self.window_size // 2
-            window_y = self.y - self.window_size // 2
-            self.overlay.geometry(f"{self.window_size}x{self.window_size}+{window_x}+{window_y}")
+            self._move_geometry()
             if self.canvas:
-                self.canvas.config(width=self.window_size, height=self.window_size)
-                # 重新绘制点（位置可能改变）
-                self._draw_point()
+                if size_changed:
+                    self.canvas.config(width=self.window_size, height=self.window_size)
+                    # 窗口中心改变，重新绘制点
+                    self._draw_point()
                 # 更新标签位置（如果标签存在且需要更新）
                 if update_label and self.label and self.label_widget:
                     # 只更新标签位置，不重新创建（避免调整窗口大小）
@@ -776,18 +1026,25 @@ class DraggablePoint:
         if not self.canvas:
             return
         
-        self.canvas.delete("point")
-        
         # 计算点在窗口中的位置（窗口中心）
         center_x = self.window_size // 2
         center_y = self.window_size // 2
+        x1 = center_x - self.point_size
+        y1 = center_y - self.point_size
+        x2 = center_x + self.point_size
+        y2 = center_y + self.point_size
+        
+        # 已有点时只移动坐标，避免删除并重建 canvas item
+        if self._point_id is not None:
+            self.canvas.coords(self._point_id, x1, y1, x2, y2)
+            return
         
         # 绘制圆形点
-        self.canvas.create_oval(
-            center_x - self.point_size,
-            center_y - self.point_size,
-            center_x + self.point_size,
-            center_y + self.point_size,
+        self._point_id = self.canvas.create_oval(
+            x1,
+            y1,
+            x2,
+            y2,
             fill=self.point_color,
             outline=self.point_color,
             width=2,
@@ -826,8 +1083,11 @@ class DraggablePoint:
         )
         label_text.pack()
         
-        # 先更新窗口以获取标签实际大小
-        self.overlay.update_idletasks()
+        # 让标签也可以拖动（每次重建标签都需要重新绑定）
+        if self.draggable:
+            label_frame.bind("<Button-1>", self._on_mouse_press)
+            label_frame.bind("<B1-Motion>", self._on_mouse_drag)
+            label_frame.bind("<ButtonRelease-1>", self._on_mouse_release)
         
         # 计算标签位置（相对于窗口中心，加上偏移）
         center_x = self.window_size // 2
@@ -838,48 +1098,43 @@ class DraggablePoint:
         # 将标签放置在指定位置
         label_frame.place(x=label_x, y=label_y)
         
-        # 更新窗口以获取标签实际大小
-        self.overlay.update_idletasks()
-        
         # 只有在允许调整大小时才检查并调整窗口大小
         if allow_resize:
-            # 获取标签的实际大小
-            label_width = label_frame.winfo_reqwidth()
-            label_height = label_frame.winfo_reqheight()
-            
-            # 检查标签是否超出窗口边界，如果是则调整窗口大小
-            label_right = label_x + label_width
-            label_bottom = label_y + label_height
-            label_left = label_x
-            label_top = label_y
+            # 直接用字体度量估算标签大小（加上 Frame 的 padx/pady），无需清空事件队列
+            label_width = self._font.measure(self.label) + 2 * 4
+            label_height = self._font_linespace + 2 * 2
             
-            # 计算需要的最小窗口大小
-            min_x = min(0, label_left)
-            min_y = min(0, label_top)
-            max_x = max(self.window_size, label_right)
-            max_y = max(self.window_size, label_bottom)
-            
-            new_size = max(max_x - min_x, max_y - min_y) + 20  # 额外留出20像素边距
-            
-            # 如果窗口需要调整大小
-            if new_size > self.window_size:
-                self.window_size = new_size
-                # 重新计算窗口位置（保持点位置不变）
-                window_x = self.x - self.window_size // 2
-                window_y = self.y - self.window_size // 2
-                self.overlay.geometry(f"{self.window_size}x{self.window_size}+{window_x}+{window_y}")
-                if self.canvas:
-                    self.canvas.config(width=self.window_size, height=self.window_size)
-                    # 重新绘制点（位置可能改变）
-                    self._draw_point()
-                # 重新计算标签位置
-                center_x = self.window_size // 2
-                center_y = self.window_size // 2
-                label_x = center_x + self.label_offset_x
-                label_y = center_y + self.label_offset_y
-                label_frame.place(x=label_x, y=label_y)
+            measured = (label_width, label_height)
+            if measured != self._measured_label_size:
+                self._measured_label_size = measured
+                # 点位于窗口中心，标签按偏移放置：窗口半边需要容纳标签在各方向上的最远距离
+                needed = 2 * max(
+                    self.label_offset_x + label_width,
+                    -self.label_offset_x,
+                    self.label_offset_y + label_height,
+                    -self.label_offset_y,
+                ) + 20  # 额外留出20像素边距
+                # 超出当前大小一定余量时才放大窗口，避免标签细微变化引起窗口跳动
+                if needed > self.window_size + 8:
+                    self._grow_window(label_frame, needed)
         
         self.label_widget = label_frame
+        self._shown_label = self.label
+    
+    def _grow_window(self, label_frame, new_size: int):
+        """
+        放大窗口以容纳标签（保持点位置不变）
+        
+        Args:
+            label_frame: 标签 Frame
+            new_size: 新的窗口大小
+        """
+        self.window_size = new_size
+        # 重新计算窗口位置（保持点位置不变）并重绘点
+        self._setup_geometry(update_label=False, size_changed=True)
+        # 重新计算标签位置
+        center = self.window_size // 2
+        label_frame.place(x=center + self.label_offset_x, y=center + self.label_offset_y)
     
     def _bind_events(self):
         """绑定事件"""
@@ -891,12 +1146,6 @@ class DraggablePoint:
             self.canvas.bind("<Button-1>", self._on_mouse_press)
             self.canvas.bind("<B1-Motion>", self._on_mouse_drag)
             self.canvas.bind("<ButtonRelease-1>", self._on_mouse_release)
-            
-            # 让标签也可以拖动
-            if self.label_widget:
-                self.label_widget.bind("<Button-1>", self._on_mouse_press)
-                self.label_widget.bind("<B1-Motion>", self._on_mouse_drag)
-                self.label_widget.bind("<ButtonRelease-1>", self._on_mouse_release)
     
     def _on_mouse_press(self, event):
         """鼠标按下事件处理"""
@@ -921,24 +1170,46 @@ class DraggablePoint:
             new_window_y = self.offset_y + delta_y
             
             # 限制窗口不超出屏幕
-            screen_width = self.root.winfo_screenwidth()
-            screen_height = self.root.winfo_screenheight()
-            new_window_x = max(0, min(new_window_x, screen_width - self.window_size))
-            new_window_y = max(0, min(new_window_y, screen_height - self.window_size))
+            # （热路径：用条件表达式代替 max/min 内建函数调用）
+            screen_width = self._screen_w
+            screen_height = self._screen_h
+            window_size = self.window_size
+            max_x = screen_width - window_size
+            max_y = screen_height - window_size
+            new_window_x = max_x if new_window_x > max_x else new_window_x
+            new_window_x = 0 if new_window_x < 0 else new_window_x
+            new_window_y = max_y if new_window_y > max_y else new_window_y
+            new_window_y = 0 if new_window_y < 0 else new_window_y
             
             # 计算点的实际坐标（窗口中心）
-            new_x = new_window_x + self.window_size // 2
-            new_y = new_window_y + self.window_size // 2
+            new_x = new_window_x + window_size // 2
+            new_y = new_window_y + window_size // 2
             
             # 限制点不超出屏幕
-            new_x = max(self.point_size, min(new_x, screen_width - self.point_size))
-            new_y = max(self.point_size, min(new_y, screen_height - self.point_size))
+            point_size = self.point_size
+            max_x = screen_width - point_size
+            max_y = screen_height - point_size
+            new_x = max_x if new_x > max_x else new_x
+            new_x = point_size if new_x < point_size else new_x
+            new_y = max_y if new_y > max_y else new_y
+            new_y = point_size if new_y < point_size else new_y
             
             # 更新位置（拖动过程中不通知回调，只在释放时通知）
-            self.x = int(new_x)
-            self.y = int(new_y)
-            # 拖动过程中只更新位置，不重新创建标签（避免调整窗口大小）
-            self._update_geometry(update_label=True)  # 仍然更新标签位置，但不重新创建
+            new_x = int(new_x)
+            new_y = int(new_y)
+            if new_x == self.x and new_y == self.y:
+                # 位置没有变化，无需移动窗口
+                return "break"
+            self.x = new_x
+            self.y = new_y
+            self._pending_commit = True
+            # 拖动过程中只移动窗口，标签和点相对窗口的位置不变
+            self._move_geometry()
+            if self.on_move is not None:
+                try:
+                    self.on_move(new_x, new_y)
+                except Exception:
+                    _log.exception("移动回调执行错误")
             
             return "break"
     
@@ -946,8 +1217,10 @@ class DraggablePoint:
         """鼠标释放事件处理"""
         if self.dragging:
             self.dragging = False
-            # 拖动结束后通知回调
-            self._notify_callback()
+            # 拖动结束后通知回调（单击未移动时不通知）
+            if self._pending_commit:
+                self._pending_commit = False
+                self._notify_callback()
             return "break"
     
     def _notify_callback(self):
@@ -955,8 +1228,8 @@ class DraggablePoint:
         if self.callback:
             try:
                 self.callback(self.x, self.y)
-            except Exception as e:
-                print(f"回调函数执行错误: {e}")
+            except Exception:
+                _log.exception("回调函数执行错误")
     
     def get_position(self) -> Tuple[int, int]:
         """
@@ -967,12 +1240,39 @@ class DraggablePoint:
         """
         return (self.x, self.y)
     
+    def clamp_to_screen(self) -> bool:
+        """
+        将点标记移回屏幕范围内（使用 show() 时缓存的屏幕尺寸，移动后会通知回调）
+        
+        Returns:
+            是否发生了移动
+        """
+        if not self.visible:
+            return False
+        point_size = self.point_size
+        max_x = self._screen_w - point_size
+        max_y = self._screen_h - point_size
+        x = max_x if self.x > max_x else self.x
+        x = point_size if x < point_size else x
+        y = max_y if self.y > max_y else self.y
+        y = point_size if y < point_size else y
+        if x == self.x and y == self.y:
+            return False
+        self.update_position(x, y)
+        return True
+    
     def destroy(self):
         """销毁点标记"""
-        self.hide()
+        if self.overlay:
+            self.overlay.destroy()
+        self.overlay = None
+        self.canvas = None
+        self.label_widget = None
+        self._shown_label = None
+        self._point_id = None
+        self.visible = False
         # 从全局注册表中移除
-        if self in _point_registry:
-            _point_registry.remove(self)
+        _point_registry.pop(id(self), None)
 
 
 def create_overlay(
@@ -998,7 +1298,7 @@ def create_overlay(
         label: 标签文本
         on_rect_update: 矩形更新回调（拖动或调整大小时触发）
         callback: 位置更新回调（已弃用，使用 on_rect_update）
-        **kwargs: 其他样式参数（包括 draggable, resizable 等）
+        **kwargs: 其他样式参数（包括 draggable, resizable, on_move 等）
     
     Returns:
         DraggableOverlay 实例
@@ -1027,19 +1327,21 @@ def clear_all_overlays():
     
     销毁所有已创建的浮层并清空注册表
     """
-    # 创建列表的副本，避免在迭代时修改列表
-    overlays = _overlay_registry.copy()
-    
-    # 销毁所有浮层
-    for overlay in overlays:
+    # 逐个弹出并销毁（destroy() 再次注销时为空操作），无需复制整个注册表
+    count = 0
+    errors = []
+    while _overlay_registry:
+        _, overlay = _overlay_registry.popitem()
+        count += 1
         try:
             overlay.destroy()
         except Exception as e:
-            print(f"销毁浮层时出错: {e}")
+            errors.append(e)
     
-    # 清空注册表
-    _overlay_registry.clear()
-    print(f"已清空所有浮层（共 {len(overlays)} 个）")
+    # 出错时只汇总记录一次，避免逐条输出拖慢关闭过程
+    if errors:
+        _log.warning("销毁浮层时出错 %d 个: %r", len(errors), errors[:3])
+    _log.info("已清空所有浮层（共 %d 个）", count)
 
 
 def get_all_overlays() -> List[DraggableOverlay]:
@@ -1049,7 +1351,7 @@ def get_all_overlays() -> List[DraggableOverlay]:
     Returns:
         所有浮层的列表
     """
-    return _overlay_registry.copy()
+    return list(_overlay_registry.values())
 
 
 def create_point(
@@ -1071,7 +1373,7 @@ def create_point(
         label: 标签文本
         draggable: 是否可拖动
         callback: 拖动回调函数，参数为 (x, y)，在拖动结束时触发
-        **kwargs: 其他样式参数（包括 point_color, point_size, label_bg 等）
+        **kwargs: 其他样式参数（包括 point_color, point_size, label_bg, on_move 等）
     
     Returns:
         DraggablePoint 实例
@@ -1095,19 +1397,21 @@ def clear_all_points():
     
     销毁所有已创建的点标记并清空注册表
     """
-    # 创建列表的副本，避免在迭代时修改列表
-    points = _point_registry.copy()
-    
-    # 销毁所有点标记
-    for point in points:
+    # 逐个弹出并销毁（destroy() 再次注销时为空操作），无需复制整个注册表
+    count = 0
+    errors = []
+    while _point_registry:
+        _, point = _point_registry.popitem()
+        count += 1
         try:
             point.destroy()
         except Exception as e:
-            print(f"销毁点标记时出错: {e}")
+            errors.append(e)
     
-    # 清空注册表
-    _point_registry.clear()
-    print(f"已清空所有点标记（共 {len(points)} 个）")
+    # 出错时只汇总记录一次，避免逐条输出拖慢关闭过程
+    if errors:
+        _log.warning("销毁点标记时出错 %d 个: %r", len(errors), errors[:3])
+    _log.info("已清空所有点标记（共 %d 个）", count)
 
 
 def get_all_points() -> List[DraggablePoint]:
@@ -1117,7 +1421,7 @@ def get_all_points() -> List[DraggablePoint]:
     Returns:
         所有点标记的列表
     """
-    return _point_registry.copy()
+    return list(_point_registry.values())
 
 
 # 测试代码
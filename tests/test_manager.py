@@ -1,29 +1,60 @@
 import json
+import os
 import tempfile
+import threading
+import time
 import unittest
 from pathlib import Path
+from queue import Queue
 from typing import Any, Dict
-from unittest.mock import patch
+from unittest.mock import DEFAULT, MagicMock, patch
 
+import desktop_overlay_manager
 from desktop_overlay_manager import Desktop_overlay_manager
 
+SCREEN_WIDTH = 1920
+SCREEN_HEIGHT = 1080
+
 
 class FakeTk:
+    def __init__(self) -> None:
+        self._tasks: "Queue[Any]" = Queue()
+        self._running = False
+
     def withdraw(self) -> None:
         pass
 
-    def update_idletasks(self) -> None:
-        pass
+    def after_idle(self, func, *args: Any) -> None:
+        self._tasks.put((func, args))
 
-    def update(self) -> None:
-        pass
+    def after(self, ms: int, func, *args: Any) -> threading.Timer:
+        timer = threading.Timer(ms / 1000, self.after_idle, args=(func, *args))
+        timer.daemon = True
+        timer.start()
+        return timer
+
+    def after_cancel(self, timer: threading.Timer) -> None:
+        timer.cancel()
+
+    def mainloop(self) -> None:
+        self._running = True
+        while self._running:
+            func, args = self._tasks.get()
+            func(*args)
+
+    def quit(self) -> None:
+        self._running = False
 
     def destroy(self) -> None:
         pass
 
 
 class FakeOverlay:
-    def __init__(self, *, x: int, y: int, width: int, height: int, label: str, on_rect_update, **kwargs: Any) -> None:
+    __slots__ = ("x", "y", "width", "height", "label", "visible", "_callback", "_on_move")
+
+    def __init__(
+        self, *, x: int, y: int, width: int, height: int, label: str, on_rect_update, on_move=None, **kwargs: Any
+    ) -> None:
         self.x = x
         self.y = y
         self.width = width
@@ -31,6 +62,7 @@ class FakeOverlay:
         self.label = label
         self.visible = True
         self._callback = on_rect_update
+        self._on_move = on_move
 
     def update_position(self, x: int, y: int, notify: bool = True) -> None:
         self.x = x
@@ -56,6 +88,14 @@ class FakeOverlay:
     def get_position(self):
         return self.x, self.y, self.width, self.height
 
+    def clamp_to_screen(self) -> bool:
+        x = min(max(self.x, 0), SCREEN_WIDTH - self.width)
+        y = min(max(self.y, 0), SCREEN_HEIGHT - self.height)
+        if (x, y) == (self.x, self.y):
+            return False
+        self.update_position(x, y)
+        return True
+
     def simulate_change(self, x: int, y: int, width: int, height: int) -> None:
         self.x = x
         self.y = y
@@ -63,14 +103,23 @@ class FakeOverlay:
         self.height = height
         self._callback(self.x, self.y, self.width, self.height)
 
+    def simulate_drag(self, x: int, y: int) -> None:
+        # Mid-drag redraw: only the motion hook fires, not the release callback.
+        self.x = x
+        self.y = y
+        self._on_move(self.x, self.y, self.width, self.height)
+
 
 class FakePoint:
-    def __init__(self, *, x: int, y: int, label: str, callback, **kwargs: Any) -> None:
+    __slots__ = ("x", "y", "label", "visible", "_callback", "_on_move")
+
+    def __init__(self, *, x: int, y: int, label: str, callback, on_move=None, **kwargs: Any) -> None:
         self.x = x
         self.y = y
         self.label = label
         self.visible = True
         self._callback = callback
+        self._on_move = on_move
 
     def update_position(self, x: int, y: int, notify: bool = True) -> None:
         self.x = x
@@ -90,41 +139,52 @@ class FakePoint:
     def get_position(self):
         return self.x, self.y
 
+    def clamp_to_screen(self) -> bool:
+        x = min(max(self.x, 0), SCREEN_WIDTH)
+        y = min(max(self.y, 0), SCREEN_HEIGHT)
+        if (x, y) == (self.x, self.y):
+            return False
+        self.update_position(x, y)
+        return True
+
     def simulate_change(self, x: int, y: int) -> None:
         self.x = x
         self.y = y
         self._callback(self.x, self.y)
 
+    def simulate_drag(self, x: int, y: int) -> None:
+        self.x = x
+        self.y = y
+        self._on_move(self.x, self.y)
+
 
 class DesktopOverlayManagerTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        # One temporary root for the class; each test gets its own subdirectory.
+        cls._root_tmp = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(cls._root_tmp.cleanup)
+
     def setUp(self) -> None:
-        self.tempdir = tempfile.TemporaryDirectory()
-        self.addCleanup(self.tempdir.cleanup)
+        self.config_dir = os.path.join(self._root_tmp.name, self._testMethodName)
+        os.makedirs(self.config_dir)
 
+        # Tk lives on the tkinter module; the rest are package-level names.
         self.tk_patcher = patch("desktop_overlay_manager.tk.Tk", FakeTk)
-        self.create_overlay_patcher = patch(
-            "desktop_overlay_manager.create_overlay",
-            side_effect=lambda **kwargs: FakeOverlay(**kwargs),
+        self.package_patcher = patch.multiple(
+            "desktop_overlay_manager",
+            create_overlay=MagicMock(side_effect=lambda **kwargs: FakeOverlay(**kwargs)),
+            create_point=MagicMock(side_effect=lambda **kwargs: FakePoint(**kwargs)),
+            clear_all_overlays=DEFAULT,
+            clear_all_points=DEFAULT,
         )
-        self.create_point_patcher = patch(
-            "desktop_overlay_manager.create_point",
-            side_effect=lambda **kwargs: FakePoint(**kwargs),
-        )
-        self.clear_overlays_patcher = patch("desktop_overlay_manager.clear_all_overlays")
-        self.clear_points_patcher = patch("desktop_overlay_manager.clear_all_points")
-
-        for patcher in (
-            self.tk_patcher,
-            self.create_overlay_patcher,
-            self.create_point_patcher,
-            self.clear_overlays_patcher,
-            self.clear_points_patcher,
-        ):
+
+        for patcher in (self.tk_patcher, self.package_patcher):
             patcher.start()
             self.addCleanup(patcher.stop)
 
     def _make_manager(self) -> Desktop_overlay_manager:
-        manager = Desktop_overlay_manager(config_dir=self.tempdir.name, loop_interval=0.001)
+        manager = Desktop_overlay_manager(config_dir=self.config_dir, loop_interval=0.001)
 
         def cleanup_manager(m: Desktop_overlay_manager = manager) -> None:
             if m._tk_thread and m._tk_thread.is_alive():
@@ -133,8 +193,12 @@ class DesktopOverlayManagerTests(unittest.TestCase):
         self.addCleanup(cleanup_manager)
         return manager
 
+    def _wait_for_tk(self, manager: Desktop_overlay_manager) -> None:
+        # Mutators return immediately; a synchronous no-op runs after them.
+        manager._call_in_tk_thread(lambda: None)
+
     def _read_config(self) -> Dict[str, Dict[str, Any]]:
-        path = Path(self.tempdir.name) / "overlays.json"
+        path = Path(self.config_dir) / "overlays.json"
         if not path.exists():
             return {}
         with path.open("r", encoding="utf-8") as fh:
@@ -144,9 +208,11 @@ class DesktopOverlayManagerTests(unittest.TestCase):
         manager = self._make_manager()
         manager.registerRect("rect-1", label="rect")
         manager.registerPosition("point-1", label="point")
+        self._wait_for_tk(manager)
 
         manager._rects["rect-1"].simulate_change(10, 20, 300, 200)  # type: ignore[attr-defined]
         manager._points["point-1"].simulate_change(30, 40)  # type: ignore[attr-defined]
+        manager.destroy()
 
         config = self._read_config()
         self.assertIn("rects", config)
@@ -157,9 +223,12 @@ class DesktopOverlayManagerTests(unittest.TestCase):
     def test_getters_use_persisted_data_when_widgets_absent(self) -> None:
         first = self._make_manager()
         first.registerRect("rect-2", label="rect")
+        self._wait_for_tk(first)
         first._rects["rect-2"].simulate_change(50, 60, 150, 160)  # type: ignore[attr-defined]
         first.registerPosition("point-2", label="point")
+        self._wait_for_tk(first)
         first._points["point-2"].simulate_change(70, 80)  # type: ignore[attr-defined]
+        first.destroy()
 
         second = self._make_manager()
         rect = second.getRect("rect-2")
@@ -168,6 +237,276 @@ class DesktopOverlayManagerTests(unittest.TestCase):
         self.assertEqual(rect, {"x": 50, "y": 60, "width": 150, "height": 160})
         self.assertEqual(pos, {"x": 70, "y": 80})
 
+    def test_drag_updates_are_coalesced_into_one_write(self) -> None:
+        manager = self._make_manager()
+        manager.registerRect("rect-4", label="rect")
+        self._wait_for_tk(manager)
+
+        with patch.object(manager, "_write_config_file") as write:
+            for offset in range(5):
+                manager._rects["rect-4"].simulate_change(offset, offset, 100, 100)  # type: ignore[attr-defined]
+            manager.destroy()
+
+        write.assert_called_once()
+        self.assertEqual(manager._rect_configs["rect-4"]["x"], 4)
+
+    def test_reports_matching_persisted_geometry_are_ignored(self) -> None:
+        manager = self._make_manager()
+        manager.registerRect("rect-8", label="rect")
+        self._wait_for_tk(manager)
+        manager._rects["rect-8"].simulate_change(3, 4, 50, 60)  # type: ignore[attr-defined]
+        manager._call_in_tk_thread(manager._flush_config)
+
+        with patch.object(manager, "_schedule_flush") as schedule:
+            manager._rects["rect-8"].simulate_change(3, 4, 50, 60)  # type: ignore[attr-defined]
+
+        schedule.assert_not_called()
+
+    def test_report_after_unnotified_move_is_persisted(self) -> None:
+        manager = self._make_manager()
+        manager.registerRect("rect-12", label="rect")
+        self._wait_for_tk(manager)
+        manager._rects["rect-12"].simulate_change(3, 4, 50, 60)  # type: ignore[attr-defined]
+        # Re-registering moves the widget without notifying; the flush writes that spot.
+        manager.registerRect("rect-12", x=500, y=600)
+        self._wait_for_tk(manager)
+        manager._call_in_tk_thread(manager._flush_config)
+        self.assertEqual(manager._rect_configs["rect-12"]["x"], 500)
+
+        manager._rects["rect-12"].simulate_change(3, 4, 50, 60)  # type: ignore[attr-defined]
+        manager._call_in_tk_thread(manager._flush_config)
+
+        self.assertEqual(manager._rect_configs["rect-12"]["x"], 3)
+
+    def test_debounced_write_runs_on_writer_thread(self) -> None:
+        manager = self._make_manager()
+        manager.registerRect("rect-7", label="rect")
+        self._wait_for_tk(manager)
+
+        writers = []
+        original = manager._write_config_file
+
+        def record(data: Dict[str, Any]) -> None:
+            original(data)
+            writers.append(threading.current_thread())
+
+        with patch.object(manager, "_write_config_file", side_effect=record):
+            manager._rects["rect-7"].simulate_change(1, 2, 30, 40)  # type: ignore[attr-defined]
+            deadline = time.monotonic() + 5
+            while not writers and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+        self.assertEqual(writers, [manager._writer_thread])
+        self.assertEqual(self._read_config()["rects"]["rect-7"]["x"], 1)
+
+    def test_writer_thread_logs_write_failures(self) -> None:
+        manager = self._make_manager()
+        manager.registerRect("rect-11", label="rect")
+        self._wait_for_tk(manager)
+
+        with self.assertLogs("desktop_overlay_manager", level="ERROR") as logs:
+            with patch.object(manager, "_write_config_file", side_effect=OSError("disk full")):
+                manager._rects["rect-11"].simulate_change(1, 2, 30, 40)  # type: ignore[attr-defined]
+                deadline = time.monotonic() + 5
+                while not logs.output and time.monotonic() < deadline:
+                    time.sleep(0.01)
+
+        self.assertIn("disk full", "\n".join(logs.output))
+        self.assertTrue(manager._writer_thread.is_alive())  # type: ignore[union-attr]
+
+    def test_legacy_files_are_migrated_once(self) -> None:
+        legacy = Path(self.config_dir) / "rects.json"
+        legacy.write_text(json.dumps({"old": {"x": 1, "y": 2, "width": 60, "height": 70}}), encoding="utf-8")
+
+        manager = self._make_manager()
+        rect = manager.getRect("old")
+
+        self.assertEqual(rect, {"x": 1, "y": 2, "width": 60, "height": 70})
+        self.assertFalse(legacy.exists())
+        self.assertTrue((Path(self.config_dir) / ".migrated").exists())
+        self.assertIn("old", self._read_config()["rects"])
+
+    def test_unchanged_config_is_not_rewritten(self) -> None:
+        manager = self._make_manager()
+        payload = {"rects": {}, "points": {"p": {"x": 1, "y": 2, "label": "p"}}}
+        manager._write_config_file(payload)
+        path = Path(self.config_dir) / "overlays.json"
+        path.unlink()
+
+        manager._write_config_file(payload)
+
+        self.assertFalse(path.exists())
+
+    def _assert_config_round_trip(self) -> None:
+        first = self._make_manager()
+        first.registerRect("rect-16", label="矩形")
+        self._wait_for_tk(first)
+        first._rects["rect-16"].simulate_change(1, 2, 30, 40)  # type: ignore[attr-defined]
+        first.destroy()
+
+        # Whichever serialiser wrote it, the file is plain UTF-8 JSON.
+        self.assertEqual(self._read_config()["rects"]["rect-16"]["label"], "矩形")
+        second = self._make_manager()
+        self.assertEqual(second.getRect("rect-16"), {"x": 1, "y": 2, "width": 30, "height": 40})
+        # Non-string keys are written as strings by both serialisers.
+        raw = desktop_overlay_manager._dumps({"points": {1: {"x": 2}}})
+        self.assertEqual(desktop_overlay_manager._loads(raw), {"points": {"1": {"x": 2}}})
+
+    def test_config_round_trips_with_stdlib_json(self) -> None:
+        with patch.object(desktop_overlay_manager, "orjson", None):
+            self._assert_config_round_trip()
+
+    @unittest.skipIf(desktop_overlay_manager.orjson is None, "orjson is not installed")
+    def test_config_round_trips_with_orjson(self) -> None:
+        self._assert_config_round_trip()
+
+    def test_fsync_option_syncs_before_replace(self) -> None:
+        manager = Desktop_overlay_manager(config_dir=self.config_dir, loop_interval=0.001, fsync=True)
+        self.addCleanup(manager.destroy)
+
+        with patch("desktop_overlay_manager.os.fsync") as fsync:
+            manager._write_config_file({"rects": {}, "points": {}})
+
+        fsync.assert_called_once()
+        self.assertEqual(self._read_config(), {"rects": {}, "points": {}})
+
+    def test_getters_read_snapshot_without_tk_hop(self) -> None:
+        manager = self._make_manager()
+        manager.registerRect("rect-5", label="rect")
+        self._wait_for_tk(manager)
+        manager._rects["rect-5"].simulate_change(5, 6, 70, 80)  # type: ignore[attr-defined]
+
+        with patch.object(manager, "_call_in_tk_thread") as call:
+            rect = manager.getRect("rect-5")
+
+        call.assert_not_called()
+        self.assertEqual(rect, {"x": 5, "y": 6, "width": 70, "height": 80})
+
+    def test_getters_follow_widgets_during_drag(self) -> None:
+        manager = self._make_manager()
+        manager.registerRect("rect-17", label="rect")
+        manager.registerPosition("point-17", label="point")
+        self._wait_for_tk(manager)
+
+        with patch.object(manager, "_schedule_flush") as schedule:
+            manager._rects["rect-17"].simulate_drag(15, 25)  # type: ignore[attr-defined]
+            manager._points["point-17"].simulate_drag(35, 45)  # type: ignore[attr-defined]
+
+        schedule.assert_not_called()
+        self.assertEqual(manager.getRect("rect-17"), {"x": 15, "y": 25, "width": 240, "height": 160})
+        self.assertEqual(manager.getPosition("point-17"), {"x": 35, "y": 45})
+
+    def test_persisted_getter_result_is_memoized(self) -> None:
+        first = self._make_manager()
+        first.registerPosition("point-6", label="point")
+        self._wait_for_tk(first)
+        first._points["point-6"].simulate_change(11, 12)  # type: ignore[attr-defined]
+        first.destroy()
+
+        second = self._make_manager()
+        self.assertEqual(second.getPosition("point-6"), {"x": 11, "y": 12})
+        with patch.object(second, "_call_in_tk_thread") as call:
+            pos = second.getPosition("point-6")
+
+        call.assert_not_called()
+        self.assertEqual(pos, {"x": 11, "y": 12})
+
+    def test_bulk_getters_return_all_registered_widgets(self) -> None:
+        manager = self._make_manager()
+        manager.registerRect("rect-9", label="rect")
+        manager.registerPosition("point-9", label="point", x=5, y=6)
+
+        with patch.object(manager, "_call_in_tk_thread", wraps=manager._call_in_tk_thread) as call:
+            rects = manager.getAllRects()
+
+        call.assert_called_once()
+        self.assertEqual(rects, {"rect-9": {"x": 120, "y": 120, "width": 240, "height": 160}})
+        self.assertEqual(manager.getAllPositions(), {"point-9": {"x": 5, "y": 6}})
+
+    def test_bulk_getters_match_single_getters(self) -> None:
+        first = self._make_manager()
+        first.registerRect("rect-18", label="rect", x=1, y=2, width=300, height=400)
+        first.registerPosition("point-18", label="point", x=3, y=4)
+        self._wait_for_tk(first)
+        first._rects["rect-18"].simulate_change(1, 2, 300, 400)  # type: ignore[attr-defined]
+        first._points["point-18"].simulate_change(3, 4)  # type: ignore[attr-defined]
+        first.destroy()
+
+        second = self._make_manager()
+        second.registerRect("rect-19", label="rect")
+        second.registerPosition("point-19", label="point")
+        self._wait_for_tk(second)
+        second._rects["rect-19"].simulate_drag(50, 60)  # type: ignore[attr-defined]
+        second._points["point-19"].simulate_drag(70, 80)  # type: ignore[attr-defined]
+        # The widget moved again but has not redrawn yet: getters report the redrawn spot.
+        second._rects["rect-19"].x = 55  # type: ignore[attr-defined]
+
+        rects = second.getAllRects()
+        points = second.getAllPositions()
+
+        self.assertEqual(rects["rect-19"]["x"], 50)
+        self.assertEqual(set(rects), {"rect-18", "rect-19"})
+        self.assertEqual(set(points), {"point-18", "point-19"})
+        self.assertEqual(rects, {rect_id: second.getRect(rect_id) for rect_id in rects})
+        self.assertEqual(points, {point_id: second.getPosition(point_id) for point_id in points})
+
+    def test_errors_in_posted_calls_are_logged(self) -> None:
+        manager = self._make_manager()
+
+        with patch(
+            "desktop_overlay_manager.create_overlay",
+            side_effect=TypeError("unexpected keyword argument 'colour'"),
+        ):
+            with self.assertLogs("desktop_overlay_manager", level="ERROR") as logs:
+                manager.registerRect("rect-10", label="rect", colour="red")
+                self._wait_for_tk(manager)
+
+        self.assertIn("colour", "\n".join(logs.output))
+        self.assertIsNone(manager.getRect("rect-10"))
+
+    def test_destroy_tears_down_even_if_final_write_fails(self) -> None:
+        manager = self._make_manager()
+        manager.registerRect("rect-13", label="rect")
+        self._wait_for_tk(manager)
+        manager._rects["rect-13"].simulate_change(1, 2, 30, 40)  # type: ignore[attr-defined]
+
+        with patch.object(manager, "_write_config_file", side_effect=OSError("read-only")):
+            with self.assertRaises(OSError):
+                manager.destroy()
+
+        manager._tk_thread.join(5)  # type: ignore[union-attr]
+        self.assertFalse(manager._tk_thread.is_alive())  # type: ignore[union-attr]
+        self.assertEqual(manager._rects, {})
+        with self.assertRaises(RuntimeError):
+            manager.getRect("rect-13")
+
+    def test_clamp_all_to_screen_moves_and_persists_widgets(self) -> None:
+        manager = self._make_manager()
+        manager.registerRect("rect-14", label="rect", x=5000, y=-20)
+        manager.registerPosition("point-14", label="point", x=10, y=9000)
+        manager.registerPosition("point-15", label="point", x=10, y=20)
+        self._wait_for_tk(manager)
+
+        # Hold the Tk thread so the getters below run before the clamp does.
+        gate = threading.Event()
+        manager._post_to_tk_thread(gate.wait, 5)
+        manager.clampAllToScreen()
+        threading.Timer(0.05, gate.set).start()
+
+        self.assertEqual(manager.getRect("rect-14"), {"x": 1680, "y": 0, "width": 240, "height": 160})
+        self.assertEqual(manager.getPosition("point-14"), {"x": 10, "y": 1080})
+        manager.destroy()
+        config = self._read_config()
+        self.assertEqual(config["rects"]["rect-14"]["x"], 1680)
+        self.assertNotIn("point-15", config["points"])
+
+    def test_calls_after_destroy_raise(self) -> None:
+        manager = self._make_manager()
+        manager.destroy()
+
+        with self.assertRaises(RuntimeError):
+            manager.getRect("rect-3")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,183 @@
+import gc
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from desktop_overlay_manager import overlay as ov
+
+
+def _make_widget(*args, **kwargs) -> MagicMock:
+    widget = MagicMock()
+    widget.winfo_x.return_value = 100
+    widget.winfo_y.return_value = 100
+    return widget
+
+
+def _make_font(*args, **kwargs) -> MagicMock:
+    font = MagicMock()
+    font.measure.return_value = 40
+    font.metrics.return_value = 14
+    return font
+
+
+def _event(x_root: int, y_root: int) -> SimpleNamespace:
+    return SimpleNamespace(x=5, y=5, x_root=x_root, y_root=y_root)
+
+
+class OverlayWidgetTests(unittest.TestCase):
+    def setUp(self) -> None:
+        for name in ("Toplevel", "Canvas", "Frame", "Label"):
+            patcher = patch.object(ov.tk, name, side_effect=_make_widget)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        font_patcher = patch.object(ov.tkfont, "Font", side_effect=_make_font)
+        font_patcher.start()
+        self.addCleanup(font_patcher.stop)
+        self.addCleanup(ov.clear_all_overlays)
+        self.addCleanup(ov.clear_all_points)
+
+        self.root = MagicMock()
+        self.root.winfo_screenwidth.return_value = 1920
+        self.root.winfo_screenheight.return_value = 1080
+
+    def test_unreferenced_widgets_stay_registered(self) -> None:
+        ov.create_point(root=self.root, x=300, y=300, label="p", draggable=False)
+        ov.create_overlay(root=self.root, x=10, y=10, width=200, height=100, draggable=False)
+        gc.collect()
+
+        self.assertEqual(len(ov.get_all_points()), 1)
+        self.assertEqual(len(ov.get_all_overlays()), 1)
+
+    def test_widgets_accept_caller_attributes(self) -> None:
+        overlay = ov.create_overlay(root=self.root, x=10, y=10, width=200, height=100)
+        point = ov.create_point(root=self.root, x=300, y=300)
+
+        overlay.tag = "rect"
+        point.tag = "point"
+
+        self.assertEqual((overlay.tag, point.tag), ("rect", "point"))
+
+    def _bound_events(self, widget: MagicMock) -> set:
+        return {c.args[0] for c in widget.bind.call_args_list}
+
+    def test_point_label_keeps_drag_bindings_across_hide_show(self) -> None:
+        point = ov.create_point(root=self.root, x=300, y=300, label="p")
+        label = point.label_widget
+
+        point.hide()
+        point.show()
+
+        self.assertIs(point.label_widget, label)
+        self.assertEqual(
+            self._bound_events(point.label_widget),
+            {"<Button-1>", "<B1-Motion>", "<ButtonRelease-1>"},
+        )
+
+    def test_rebuilt_point_label_is_draggable(self) -> None:
+        point = ov.create_point(root=self.root, x=300, y=300, label="p")
+        point.hide()
+        point.update_label("q")
+        point.show()
+
+        self.assertEqual(
+            self._bound_events(point.label_widget),
+            {"<Button-1>", "<B1-Motion>", "<ButtonRelease-1>"},
+        )
+
+    def test_clamp_to_screen_moves_widgets_back_and_notifies(self) -> None:
+        calls = []
+        overlay = ov.create_overlay(
+            root=self.root, x=5000, y=-20, width=200, height=100,
+            on_rect_update=lambda *args: calls.append(args),
+        )
+        point = ov.create_point(root=self.root, x=-50, y=300, callback=lambda *args: calls.append(args))
+
+        self.assertTrue(overlay.clamp_to_screen())
+        self.assertTrue(point.clamp_to_screen())
+        self.assertFalse(overlay.clamp_to_screen())
+
+        self.assertEqual(calls, [(1720, 0, 200, 100), (point.point_size, 300)])
+
+    def _make_recorded_overlay(self, calls: list) -> "ov.DraggableOverlay":
+        return ov.create_overlay(
+            root=self.root, x=100, y=100, width=200, height=100,
+            on_rect_update=lambda *args: calls.append(args),
+        )
+
+    def test_overlay_click_without_move_does_not_notify(self) -> None:
+        calls = []
+        overlay = self._make_recorded_overlay(calls)
+
+        overlay._on_mouse_press(_event(500, 500))
+        overlay._on_mouse_drag_global(_event(500, 500))
+        overlay._on_mouse_release_global(_event(500, 500))
+
+        self.assertEqual(calls, [])
+
+    def test_overlay_drag_notifies_once_on_release(self) -> None:
+        calls = []
+        overlay = self._make_recorded_overlay(calls)
+
+        overlay._on_mouse_press(_event(500, 500))
+        overlay._on_mouse_drag_global(_event(520, 510))
+        overlay._on_mouse_drag_global(_event(530, 540))
+        self.assertEqual(calls, [])
+        overlay._on_mouse_release_global(_event(530, 540))
+        overlay._on_mouse_release_global(_event(530, 540))
+
+        self.assertEqual(calls, [(130, 140, 200, 100)])
+
+    def test_overlay_resize_notifies_only_after_size_change(self) -> None:
+        calls = []
+        overlay = self._make_recorded_overlay(calls)
+
+        overlay._on_resize_press(_event(500, 500))
+        overlay._on_resize_release(_event(500, 500))
+        self.assertEqual(calls, [])
+
+        overlay._on_resize_press(_event(500, 500))
+        overlay._on_mouse_drag_global(_event(540, 520))
+        overlay._on_resize_release(_event(540, 520))
+
+        self.assertEqual(calls, [(100, 100, 240, 120)])
+
+    def test_move_hooks_fire_during_drag_before_release(self) -> None:
+        calls, moves = [], []
+        overlay = ov.create_overlay(
+            root=self.root, x=100, y=100, width=200, height=100,
+            on_rect_update=lambda *args: calls.append(args),
+            on_move=lambda *args: moves.append(args),
+        )
+        point = ov.create_point(
+            root=self.root, x=300, y=300,
+            callback=lambda *args: calls.append(args),
+            on_move=lambda *args: moves.append(args),
+        )
+
+        overlay._on_mouse_press(_event(500, 500))
+        overlay._on_mouse_drag_global(_event(520, 510))
+        overlay._flush_geometry()
+        point._on_mouse_press(_event(500, 500))
+        point._on_mouse_drag(_event(520, 530))
+
+        self.assertEqual(calls, [])
+        self.assertEqual(moves, [(120, 110, 200, 100), point.get_position()])
+
+    def test_point_notifies_only_after_move(self) -> None:
+        calls = []
+        point = ov.create_point(root=self.root, x=300, y=300, callback=lambda *args: calls.append(args))
+
+        point._on_mouse_press(_event(500, 500))
+        point._on_mouse_release(_event(500, 500))
+        self.assertEqual(calls, [])
+
+        point._on_mouse_press(_event(500, 500))
+        point._on_mouse_drag(_event(520, 530))
+        point._on_mouse_release(_event(520, 530))
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(calls[0], point.get_position())
+
+
+if __name__ == "__main__":
+    unittest.main()